@@ -3,23 +3,55 @@
 
 """MCP configuration loader for Claude Jail."""
 
-import json
 import logging
 import os
+import re
 from pathlib import Path
 from typing import Any
 
+import msgspec
+
 logger = logging.getLogger(__name__)
 
+# Parsed .mcp.json configs keyed by path, as (st_mtime_ns, config)
+_CACHE: dict[str, tuple[int, dict[str, Any]]] = {}
+
+
+# Same syntax os.path.expandvars accepts: $NAME or ${NAME}
+_ENV_RE = re.compile(r"\$(\w+|\{[^}]*\})", re.ASCII)
+
+
+def _substitute_env(match: re.Match[str]) -> str:
+    """Resolve one $NAME / ${NAME} reference, leaving unknown names untouched."""
+    name = match.group(1)
+    if name.startswith("{"):
+        name = name[1:-1]
+    return os.environ.get(name, match.group(0))
+
 
 def expand_env_vars(value: Any) -> Any:
-    """Recursively expand environment variables in config values."""
+    """
+    Expand environment variables in config values.
+
+    Dicts and lists are walked iteratively and updated in place; only strings
+    containing "$" are rewritten. Returns the (same) container, or the
+    expanded string if given a string.
+    """
     if isinstance(value, str):
-        return os.path.expandvars(value)
-    elif isinstance(value, dict):
-        return {k: expand_env_vars(v) for k, v in value.items()}
-    elif isinstance(value, list):
-        return [expand_env_vars(v) for v in value]
+        return _ENV_RE.sub(_substitute_env, value) if "$" in value else value
+    if not isinstance(value, dict | list):
+        return value
+
+    stack: list[dict[str, Any] | list[Any]] = [value]
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, item in items:
+            if isinstance(item, str):
+                if "$" in item:
+                    container[key] = _ENV_RE.sub(_substitute_env, item)
+            elif isinstance(item, dict | list):
+                stack.append(item)
     return value
 
 
@@ -27,6 +59,9 @@ def load_mcp_config(workspace: str | Path) -> dict[str, Any]:
     """
     Load MCP server configuration from workspace .mcp.json.
 
+    Parsed configs are cached per file and reused until the file's mtime
+    changes, so the returned dict is shared and must be treated as read-only.
+
     Args:
         workspace: Path to the workspace directory
 
@@ -34,19 +69,28 @@ def load_mcp_config(workspace: str | Path) -> dict[str, Any]:
         Dict with "mcpServers" key containing server configurations.
         Returns empty dict if no .mcp.json found.
     """
-    workspace_path = Path(workspace)
-    mcp_path = workspace_path / ".mcp.json"
+    mcp_path = os.path.join(os.fspath(workspace), ".mcp.json")
 
-    if not mcp_path.exists():
+    try:
+        mtime_ns = os.stat(mcp_path).st_mtime_ns
+    except FileNotFoundError:
         logger.debug("No .mcp.json found at %s", mcp_path)
+        _CACHE.pop(mcp_path, None)
         return {"mcpServers": {}}
 
+    cached = _CACHE.get(mcp_path)
+    if cached is not None and cached[0] == mtime_ns:
+        logger.debug("Using cached MCP config for %s", mcp_path)
+        return cached[1]
+
     try:
-        with open(mcp_path) as f:
-            config = json.load(f)
+        with open(mcp_path, "rb") as f:
+            raw = f.read()
+        config = msgspec.json.decode(raw)
 
-        # Expand environment variables in the config
-        config = expand_env_vars(config)
+        # Expand environment variables in the config; most files have none
+        if b"$" in raw:
+            config = expand_env_vars(config)
 
         # Ensure mcpServers key exists
         if "mcpServers" not in config:
@@ -57,9 +101,10 @@ def load_mcp_config(workspace: str | Path) -> dict[str, Any]:
             len(config["mcpServers"]),
             mcp_path,
         )
+        _CACHE[mcp_path] = (mtime_ns, config)
         return config
 
-    except json.JSONDecodeError as e:
+    except msgspec.DecodeError as e:
         logger.error("Failed to parse %s: %s", mcp_path, e)
         return {"mcpServers": {}}
     except Exception as e:
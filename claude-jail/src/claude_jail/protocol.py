@@ -1,30 +1,37 @@
 # ABOUTME: WebSocket protocol message types for Claude Jail
-# ABOUTME: Pydantic models for gorp-rs <-> Claude Jail communication
+# ABOUTME: msgspec tagged-union structs for gorp-rs <-> Claude Jail messages
 
 """WebSocket protocol message types for Claude Jail."""
 
-from typing import Any, Literal
+from typing import Any
 
-from pydantic import BaseModel
+import msgspec
+
+
+class _Message(msgspec.Struct, frozen=True, tag_field="type"):
+    """Base for all protocol messages; the class tag is written as "type"."""
+
+    @property
+    def type(self) -> str:
+        """The message's wire "type" tag."""
+        return self.__struct_config__.tag
 
 
 # --- Inbound messages (gorp -> Claude Jail) ---
 
 
-class QueryMessage(BaseModel):
+class QueryMessage(_Message, tag="query"):
     """Request to start or continue a conversation."""
 
-    type: Literal["query"] = "query"
     channel_id: str
     workspace: str
     prompt: str
     session_id: str | None = None
 
 
-class CloseSessionMessage(BaseModel):
+class CloseSessionMessage(_Message, tag="close_session"):
     """Request to explicitly close a session."""
 
-    type: Literal["close_session"] = "close_session"
     channel_id: str
 
 
@@ -34,35 +41,31 @@ InboundMessage = QueryMessage | CloseSessionMessage
 # --- Outbound messages (Claude Jail -> gorp) ---
 
 
-class TextMessage(BaseModel):
+class TextMessage(_Message, tag="text"):
     """Streaming text chunk from Claude."""
 
-    type: Literal["text"] = "text"
     channel_id: str
     content: str
 
 
-class ToolUseMessage(BaseModel):
+class ToolUseMessage(_Message, tag="tool_use"):
     """Notification that Claude is calling an MCP tool."""
 
-    type: Literal["tool_use"] = "tool_use"
     channel_id: str
     tool: str
     input: dict[str, Any]
 
 
-class DoneMessage(BaseModel):
+class DoneMessage(_Message, tag="done"):
     """Conversation complete."""
 
-    type: Literal["done"] = "done"
     channel_id: str
     session_id: str
 
 
-class ErrorMessage(BaseModel):
+class ErrorMessage(_Message, tag="error"):
     """Error occurred during processing."""
 
-    type: Literal["error"] = "error"
     channel_id: str
     message: str
 
@@ -70,12 +73,47 @@ class ErrorMessage(BaseModel):
 OutboundMessage = TextMessage | ToolUseMessage | DoneMessage | ErrorMessage
 
 
+class _TypeTag(msgspec.Struct):
+    """Just the "type" field of a frame, for reporting unknown tags."""
+
+    type: Any = None
+
+
+# Built once at import; msgspec dispatches on the "type" tag while decoding
+_INBOUND_DECODER = msgspec.json.Decoder(InboundMessage)
+_TYPE_TAG_DECODER = msgspec.json.Decoder(_TypeTag)
+_ENCODER = msgspec.json.Encoder()
+
+
+def _is_type_error(e: msgspec.ValidationError) -> bool:
+    """Whether a validation error is about the "type" tag itself."""
+    text = str(e)
+    return text.endswith("at `$.type`") or text == "Object missing required field `type`"
+
+
 def parse_inbound(data: dict[str, Any]) -> InboundMessage:
     """Parse a JSON dict into an inbound message."""
-    msg_type = data.get("type")
-    if msg_type == "query":
-        return QueryMessage.model_validate(data)
-    elif msg_type == "close_session":
-        return CloseSessionMessage.model_validate(data)
-    else:
-        raise ValueError(f"Unknown message type: {msg_type}")
+    try:
+        return msgspec.convert(data, InboundMessage)
+    except msgspec.ValidationError as e:
+        if _is_type_error(e):
+            raise ValueError(f"Unknown message type: {data.get('type')}") from e
+        raise
+
+
+def parse_inbound_json(raw: str | bytes) -> InboundMessage:
+    """Parse a raw JSON frame into an inbound message without an intermediate dict."""
+    try:
+        return _INBOUND_DECODER.decode(raw)
+    except msgspec.ValidationError as e:
+        if _is_type_error(e):
+            tag = _TYPE_TAG_DECODER.decode(raw).type
+            raise ValueError(f"Unknown message type: {tag}") from e
+        raise
+    except msgspec.DecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+
+
+def encode_outbound(message: OutboundMessage) -> bytes:
+    """Serialize an outbound message to UTF-8 JSON bytes for the wire."""
+    return _ENCODER.encode(message)
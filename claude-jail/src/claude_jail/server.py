@@ -4,20 +4,130 @@
 """WebSocket server entrypoint for Claude Jail."""
 
 import asyncio
-import json
 import logging
 import os
 import signal
+from collections.abc import Awaitable, Callable
 from typing import NoReturn
 
 import websockets
 from websockets import ServerConnection
 
-from .protocol import CloseSessionMessage, QueryMessage, parse_inbound
+from .protocol import (
+    CloseSessionMessage,
+    InboundMessage,
+    OutboundMessage,
+    QueryMessage,
+    TextMessage,
+    encode_outbound,
+    parse_inbound_json,
+)
 from .session import SessionManager
 
 logger = logging.getLogger(__name__)
 
+# Streamed text chunks are coalesced for this long (or until this many bytes)
+BATCH_WINDOW_SECONDS = 0.002
+BATCH_MAX_BYTES = 16 * 1024
+
+# Inbound frames arriving back-to-back are received and parsed together
+RECV_BATCH_WINDOW_SECONDS = 0.0005
+RECV_BATCH_MAX_FRAMES = 16
+
+# Outbound frames buffered per connection before producers wait on the socket
+SEND_QUEUE_SIZE = 64
+
+
+class FrameBatcher:
+    """
+    Coalesce streamed TextMessages into a single WebSocket frame.
+
+    Text chunks are buffered for up to ``window`` seconds or ``max_bytes`` and
+    then sent as one JSON array frame. Any other message type flushes the
+    buffer first and is sent on its own, so ordering on the wire is preserved.
+    A lone buffered chunk is sent as a plain object rather than an array.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], Awaitable[None]],
+        window: float = BATCH_WINDOW_SECONDS,
+        max_bytes: int = BATCH_MAX_BYTES,
+    ):
+        self._send = send
+        self._window = window
+        self._max_bytes = max_bytes
+        self._frames: list[bytes] = []
+        self._size = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    async def add(self, message: OutboundMessage) -> None:
+        """Queue a message, sending immediately unless it is a text chunk."""
+        frame = encode_outbound(message)
+
+        if not isinstance(message, TextMessage):
+            await self.flush()
+            async with self._lock:
+                await self._send(frame)
+            return
+
+        self._frames.append(frame)
+        self._size += len(frame)
+        if self._size >= self._max_bytes:
+            await self.flush()
+        elif self._timer is None and not self._flush_pending():
+            # A timed flush still blocked on send re-arms the timer when done
+            self._arm_timer()
+
+    async def flush(self) -> None:
+        """Send any buffered text chunks as a single frame."""
+        # Let a timer-driven flush that already took its frames finish first
+        task = self._flush_task
+        if task is not None and task is not asyncio.current_task():
+            await task
+            if self._flush_task is task:
+                self._flush_task = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._frames:
+            return
+
+        frames, self._frames, self._size = self._frames, [], 0
+        payload = frames[0] if len(frames) == 1 else b"[" + b",".join(frames) + b"]"
+        async with self._lock:
+            await self._send(payload)
+
+    def close(self) -> None:
+        """Drop buffered chunks and cancel any pending timed flush."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._frames, self._size = [], 0
+
+    def _flush_pending(self) -> bool:
+        return self._flush_task is not None and not self._flush_task.done()
+
+    def _arm_timer(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(self._window, self._on_timer)
+
+    def _on_timer(self) -> None:
+        # At most one timed flush exists at a time, so close() can always reach it
+        self._timer = None
+        self._flush_task = asyncio.create_task(self._timed_flush())
+
+    async def _timed_flush(self) -> None:
+        await self.flush()
+        # Chunks added while this flush waited on the outbox had no timer armed
+        if self._frames and self._timer is None:
+            self._arm_timer()
+
 
 class ClaudeJailServer:
     """WebSocket server for Claude Jail."""
@@ -27,9 +137,11 @@ class ClaudeJailServer:
         host: str = "127.0.0.1",
         port: int = 31337,
         idle_timeout: int = 300,
+        compression: bool = True,
     ):
         self.host = host
         self.port = port
+        self.compression = compression
         self.session_manager = SessionManager(idle_timeout_seconds=idle_timeout)
         self._server: websockets.WebSocketServer | None = None
         self._shutdown_event = asyncio.Event()
@@ -38,10 +150,13 @@ class ClaudeJailServer:
         """Start the WebSocket server."""
         await self.session_manager.start()
 
+        # permessage-deflate with websockets' defaults (12-bit windows, memLevel 5)
+        # keeps per-connection memory small; streamed text compresses well.
         self._server = await websockets.serve(
             self._handle_connection,
             self.host,
             self.port,
+            compression="deflate" if self.compression else None,
         )
 
         logger.info("Claude Jail listening on ws://%s:%d", self.host, self.port)
@@ -60,58 +175,103 @@ class ClaudeJailServer:
         client_addr = websocket.remote_address
         logger.info("New connection from %s", client_addr)
 
+        # Frames are handed to a writer task so streaming a response never
+        # waits on the socket; the bounded queue applies backpressure instead.
+        outbox: asyncio.Queue[bytes] = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+
         try:
-            async for raw_message in websocket:
-                await self._handle_message(websocket, raw_message)
-        except websockets.exceptions.ConnectionClosed:
+            # Failure of either the reader or the writer cancels the other
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._write_loop(websocket, outbox))
+                while True:
+                    # Dispatch stays serial per connection to preserve ordering
+                    for message in await self._receive_batch(websocket):
+                        await self._handle_message(outbox, message)
+        except* websockets.exceptions.ConnectionClosed:
             logger.info("Connection closed from %s", client_addr)
-        except Exception as e:
-            logger.exception("Error handling connection from %s: %s", client_addr, e)
+        except* Exception as eg:
+            logger.exception("Error handling connection from %s: %s", client_addr, eg.exceptions[0])
+
+    async def _write_loop(self, websocket: ServerConnection, outbox: asyncio.Queue[bytes]) -> None:
+        """Send queued frames to gorp-rs until the connection closes."""
+        while True:
+            frame = await outbox.get()
+            # gorp only reads text frames, so send the UTF-8 bytes as text
+            await websocket.send(frame, text=True)
+
+    async def _receive_batch(self, websocket: ServerConnection) -> list[InboundMessage]:
+        """
+        Wait for a frame, then drain any that follow within the receive window.
+
+        All frames in the batch are parsed up front, before any is dispatched.
+        Frames that fail to parse are logged and dropped.
+        """
+        frames = [await websocket.recv()]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + RECV_BATCH_WINDOW_SECONDS
+        while len(frames) < RECV_BATCH_MAX_FRAMES:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                frames.append(await asyncio.wait_for(websocket.recv(), timeout))
+            except TimeoutError:
+                break
+            except websockets.exceptions.ConnectionClosed:
+                # Handle what we have; the next recv() reports the closure
+                break
+
+        messages = []
+        for raw_message in frames:
+            try:
+                messages.append(parse_inbound_json(raw_message))
+            except ValueError as e:
+                # Covers malformed JSON too: msgspec's DecodeError is a ValueError
+                logger.error("Invalid message: %s", e)
+        return messages
 
     async def _handle_message(
         self,
-        websocket: ServerConnection,
-        raw_message: str | bytes,
+        outbox: asyncio.Queue[bytes],
+        message: InboundMessage,
     ) -> None:
-        """Handle a single message from gorp-rs."""
+        """Handle a single parsed message from gorp-rs."""
         try:
-            if isinstance(raw_message, bytes):
-                raw_message = raw_message.decode("utf-8")
-
-            data = json.loads(raw_message)
-            message = parse_inbound(data)
-
             if isinstance(message, QueryMessage):
-                await self._handle_query(websocket, message)
+                await self._handle_query(outbox, message)
             elif isinstance(message, CloseSessionMessage):
                 await self._handle_close_session(message)
             else:
                 logger.warning("Unknown message type: %s", type(message))
 
-        except json.JSONDecodeError as e:
-            logger.error("Invalid JSON: %s", e)
         except ValueError as e:
-            logger.error("Invalid message: %s", e)
+            logger.error("Error handling message: %s", e)
 
     async def _handle_query(
         self,
-        websocket: ServerConnection,
+        outbox: asyncio.Queue[bytes],
         message: QueryMessage,
     ) -> None:
         """Handle a query message."""
-        logger.info(
-            "Query for channel %s: %s...",
-            message.channel_id,
-            message.prompt[:50] if len(message.prompt) > 50 else message.prompt,
-        )
+        # Skip building the prompt preview when INFO is disabled
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Query for channel %s: %s...", message.channel_id, message.prompt[:50])
 
-        async for response in self.session_manager.process_query(
-            channel_id=message.channel_id,
-            workspace=message.workspace,
-            prompt=message.prompt,
-            resume_id=message.session_id,
-        ):
-            await websocket.send(response.model_dump_json())
+        batcher = FrameBatcher(outbox.put)
+        try:
+            async for response in self.session_manager.process_query(
+                channel_id=message.channel_id,
+                workspace=message.workspace,
+                prompt=message.prompt,
+                resume_id=message.session_id,
+            ):
+                await batcher.add(response)
+
+            await batcher.flush()
+        finally:
+            # On cancellation a timed flush may still be blocked on the outbox
+            batcher.close()
 
     async def _handle_close_session(self, message: CloseSessionMessage) -> None:
         """Handle a close session message."""
@@ -144,19 +304,31 @@ def main() -> None:
     host = os.environ.get("CLAUDE_JAIL_HOST", "127.0.0.1")
     port = int(os.environ.get("CLAUDE_JAIL_PORT", "31337"))
     idle_timeout = int(os.environ.get("CLAUDE_JAIL_IDLE_TIMEOUT", "300"))
+    compression = os.environ.get("CLAUDE_JAIL_COMPRESSION", "1") != "0"
 
     logger.info("Starting Claude Jail...")
     logger.info("  Host: %s", host)
     logger.info("  Port: %d", port)
     logger.info("  Idle timeout: %ds", idle_timeout)
+    logger.info("  Compression: %s", "deflate" if compression else "off")
 
     server = ClaudeJailServer(
         host=host,
         port=port,
         idle_timeout=idle_timeout,
+        compression=compression,
     )
 
-    asyncio.run(server.run_forever())
+    # uvloop is an optional extra; fall back to the stdlib loop without it
+    try:
+        import uvloop
+    except ImportError:
+        loop_factory = None
+    else:
+        loop_factory = uvloop.new_event_loop
+        logger.info("  Event loop: uvloop")
+
+    asyncio.run(server.run_forever(), loop_factory=loop_factory)
 
 
 if __name__ == "__main__":
@@ -4,11 +4,13 @@
 """Session management for Claude Jail."""
 
 import asyncio
+import heapq
 import logging
 import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import AsyncIterator
+from typing import Any, AsyncIterator
 
 from claude_code_sdk import (
     AssistantMessage,
@@ -31,19 +33,36 @@ logger = logging.getLogger(__name__)
 SdkMessage = UserMessage | AssistantMessage | SystemMessage | ResultMessage
 
 
-@dataclass
+def _text_message(channel_id: str, block: TextBlock) -> TextMessage:
+    return TextMessage(channel_id=channel_id, content=block.text)
+
+
+def _tool_use_message(channel_id: str, block: ToolUseBlock) -> ToolUseMessage:
+    return ToolUseMessage(channel_id=channel_id, tool=block.name, input=block.input)
+
+
+# Outbound builders keyed by exact block type; other block types are not forwarded
+_BLOCK_HANDLERS: dict[type, Callable[[str, Any], OutboundMessage]] = {
+    TextBlock: _text_message,
+    ToolUseBlock: _tool_use_message,
+}
+
+
+@dataclass(slots=True)
 class ChannelSession:
     """A Claude session for a specific channel."""
 
     channel_id: str
     workspace: Path
     client: ClaudeSDKClient
-    last_activity: float = field(default_factory=time.time)
+    last_activity: float = field(default_factory=time.monotonic)
     session_id: str | None = None
+    # Queries currently streaming; a pinned session is never closed as idle
+    in_flight: int = 0
 
     def touch(self) -> None:
         """Update last activity timestamp."""
-        self.last_activity = time.time()
+        self.last_activity = time.monotonic()
 
     async def close(self) -> None:
         """Close the session."""
@@ -61,6 +80,9 @@ class SessionManager:
         self.sessions: dict[str, ChannelSession] = {}
         self.idle_timeout = idle_timeout_seconds
         self._cleanup_task: asyncio.Task | None = None
+        # Min-heap of (expiry, channel_id); superseded entries are skipped lazily
+        self._expiry: list[tuple[float, str]] = []
+        self._wake = asyncio.Event()
 
     async def start(self) -> None:
         """Start the session manager and cleanup task."""
@@ -79,28 +101,54 @@ class SessionManager:
         for session in list(self.sessions.values()):
             await session.close()
         self.sessions.clear()
+        self._expiry.clear()
         logger.info("Session manager stopped")
 
     async def _cleanup_loop(self) -> None:
-        """Periodically clean up idle sessions."""
+        """Close idle sessions, sleeping until the next one is due to expire."""
         while True:
-            await asyncio.sleep(60)  # Check every minute
-            await self._cleanup_idle_sessions()
-
-    async def _cleanup_idle_sessions(self) -> None:
-        """Close sessions that have been idle too long."""
-        now = time.time()
-        to_close = [
-            channel_id
-            for channel_id, session in self.sessions.items()
-            if now - session.last_activity > self.idle_timeout
-        ]
-
-        for channel_id in to_close:
-            session = self.sessions.pop(channel_id)
+            await self._close_expired_sessions()
+
+            self._wake.clear()
+            timeout = self._expiry[0][0] - time.monotonic() if self._expiry else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except TimeoutError:
+                pass
+
+    async def _close_expired_sessions(self) -> None:
+        """Close sessions whose expiry has passed."""
+        now = time.monotonic()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, channel_id = heapq.heappop(self._expiry)
+            session = self.sessions.get(channel_id)
+
+            # Skip closed or pinned sessions, and ones touched since this was pushed.
+            # A pinned session is rescheduled when its query finishes.
+            if (
+                session is None
+                or session.in_flight
+                or session.last_activity + self.idle_timeout > now
+            ):
+                continue
+
+            del self.sessions[channel_id]
             await session.close()
             logger.info("Closed idle session for channel %s", channel_id)
 
+    def _schedule_expiry(self, session: ChannelSession) -> None:
+        """Record the session's next expiry, waking the cleanup loop if it is now first."""
+        entry = (session.last_activity + self.idle_timeout, session.channel_id)
+        heapq.heappush(self._expiry, entry)
+        if self._expiry[0] == entry:
+            self._wake.set()
+
+    def _release(self, session: ChannelSession) -> None:
+        """Unpin a session after a query and restart its idle timer."""
+        session.in_flight -= 1
+        session.touch()
+        self._schedule_expiry(session)
+
     async def get_or_create_session(
         self,
         channel_id: str,
@@ -112,6 +160,7 @@ class SessionManager:
         if channel_id in self.sessions:
             session = self.sessions[channel_id]
             session.touch()
+            self._schedule_expiry(session)
             logger.debug("Reusing existing session for channel %s", channel_id)
             return session
 
@@ -138,6 +187,7 @@ class SessionManager:
         )
 
         self.sessions[channel_id] = session
+        self._schedule_expiry(session)
         logger.info("Created new session for channel %s", channel_id)
 
         return session
@@ -161,27 +211,22 @@ class SessionManager:
         Yields:
             OutboundMessage instances (TextMessage, ToolUseMessage, DoneMessage, ErrorMessage)
         """
+        session: ChannelSession | None = None
         try:
             session = await self.get_or_create_session(channel_id, workspace, resume_id)
+            session.in_flight += 1
 
             # Connect if not connected, or send query
             await session.client.connect(prompt)
 
             # Stream responses
             async for message in session.client.receive_response():
-                if isinstance(message, AssistantMessage):
-                    for block in message.content:
-                        if isinstance(block, TextBlock):
-                            yield TextMessage(
-                                channel_id=channel_id,
-                                content=block.text,
-                            )
-                        elif isinstance(block, ToolUseBlock):
-                            yield ToolUseMessage(
-                                channel_id=channel_id,
-                                tool=block.name,
-                                input=block.input,
-                            )
+                if type(message) is not AssistantMessage:
+                    continue
+                for block in message.content:
+                    handler = _BLOCK_HANDLERS.get(type(block))
+                    if handler is not None:
+                        yield handler(channel_id, block)
 
             # Get session ID for resumption (if available)
             server_info = session.client.get_server_info()
@@ -198,3 +243,6 @@ class SessionManager:
                 channel_id=channel_id,
                 message=str(e),
             )
+        finally:
+            if session is not None:
+                self._release(session)
@@ -49,6 +49,23 @@ class TestExpandEnvVars:
         assert result[0] == "expanded"
         assert result[1] == "plain"
 
+    def test_expand_in_place(self) -> None:
+        """Containers are updated in place and returned."""
+        os.environ["TEST_INPLACE"] = "updated"
+        data = {"args": ["--token", "$TEST_INPLACE"]}
+        result = expand_env_vars(data)
+
+        assert result is data
+        assert data["args"][1] == "updated"
+
+    def test_unknown_var_left_untouched(self) -> None:
+        """References to unset variables are kept verbatim."""
+        os.environ.pop("TEST_UNSET_VAR", None)
+        data = {"key": "${TEST_UNSET_VAR}", "other": "$TEST_UNSET_VAR/bin"}
+        result = expand_env_vars(data)
+
+        assert result == {"key": "${TEST_UNSET_VAR}", "other": "$TEST_UNSET_VAR/bin"}
+
 
 class TestLoadMcpConfig:
     """Tests for loading MCP configuration."""
@@ -114,3 +131,19 @@ class TestLoadMcpConfig:
         result = load_mcp_config(tmp_path)
 
         assert result["mcpServers"] == {}
+
+    def test_load_uses_cache_until_mtime_changes(self, tmp_path: Path) -> None:
+        """Repeated loads reuse the parsed config until the file changes."""
+        mcp_path = tmp_path / ".mcp.json"
+        mcp_path.write_text(json.dumps({"mcpServers": {"a": {"command": "a"}}}))
+
+        first = load_mcp_config(tmp_path)
+        assert load_mcp_config(tmp_path) is first
+
+        mcp_path.write_text(json.dumps({"mcpServers": {"b": {"command": "b"}}}))
+        mtime_ns = mcp_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(mcp_path, ns=(mtime_ns, mtime_ns))
+
+        result = load_mcp_config(tmp_path)
+        assert "b" in result["mcpServers"]
+        assert "a" not in result["mcpServers"]
@@ -3,6 +3,9 @@
 
 """Tests for protocol message types."""
 
+import json
+
+import msgspec
 import pytest
 
 from claude_jail.protocol import (
@@ -12,7 +15,9 @@ from claude_jail.protocol import (
     QueryMessage,
     TextMessage,
     ToolUseMessage,
+    encode_outbound,
     parse_inbound,
+    parse_inbound_json,
 )
 
 
@@ -67,6 +72,31 @@ class TestInboundMessages:
         with pytest.raises(ValueError, match="Unknown message type"):
             parse_inbound(data)
 
+    def test_parse_missing_field_raises(self) -> None:
+        """A known type with missing fields raises a validation error."""
+        data = {"type": "query", "channel_id": "!abc123:matrix.org"}
+
+        with pytest.raises(ValueError, match="workspace"):
+            parse_inbound(data)
+
+    def test_parse_json_bytes(self) -> None:
+        """Parse a raw JSON frame straight from bytes."""
+        raw = b'{"type": "close_session", "channel_id": "!abc123:matrix.org"}'
+        msg = parse_inbound_json(raw)
+
+        assert isinstance(msg, CloseSessionMessage)
+        assert msg.channel_id == "!abc123:matrix.org"
+
+    def test_parse_json_unknown_type_raises(self) -> None:
+        """Unknown message type in a raw frame raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown message type: unknown"):
+            parse_inbound_json('{"type": "unknown"}')
+
+    def test_parse_json_invalid_raises(self) -> None:
+        """Malformed JSON raises ValueError."""
+        with pytest.raises(ValueError, match="Invalid JSON"):
+            parse_inbound_json(b"not valid json {{{")
+
 
 class TestOutboundMessages:
     """Tests for outbound message serialization."""
@@ -74,7 +104,7 @@ class TestOutboundMessages:
     def test_text_message_json(self) -> None:
         """TextMessage serializes correctly."""
         msg = TextMessage(channel_id="!abc:test", content="Hello world")
-        data = msg.model_dump()
+        data = msgspec.to_builtins(msg)
 
         assert data == {
             "type": "text",
@@ -89,7 +119,7 @@ class TestOutboundMessages:
             tool="mcp__matrix__send_attachment",
             input={"file": "chart.png", "room": "!abc:test"},
         )
-        data = msg.model_dump()
+        data = msgspec.to_builtins(msg)
 
         assert data == {
             "type": "tool_use",
@@ -101,7 +131,7 @@ class TestOutboundMessages:
     def test_done_message_json(self) -> None:
         """DoneMessage serializes correctly."""
         msg = DoneMessage(channel_id="!abc:test", session_id="uuid-123")
-        data = msg.model_dump()
+        data = msgspec.to_builtins(msg)
 
         assert data == {
             "type": "done",
@@ -112,10 +142,22 @@ class TestOutboundMessages:
     def test_error_message_json(self) -> None:
         """ErrorMessage serializes correctly."""
         msg = ErrorMessage(channel_id="!abc:test", message="Something went wrong")
-        data = msg.model_dump()
+        data = msgspec.to_builtins(msg)
 
         assert data == {
             "type": "error",
             "channel_id": "!abc:test",
             "message": "Something went wrong",
         }
+
+    def test_encode_outbound_bytes(self) -> None:
+        """encode_outbound produces UTF-8 JSON bytes."""
+        msg = TextMessage(channel_id="!abc:test", content="Héllo 👋")
+        raw = encode_outbound(msg)
+
+        assert isinstance(raw, bytes)
+        assert json.loads(raw) == {
+            "type": "text",
+            "channel_id": "!abc:test",
+            "content": "Héllo 👋",
+        }
@@ -0,0 +1,211 @@
+# ABOUTME: Tests for the WebSocket server helpers
+# ABOUTME: Validates frame batching and the per-connection send pipeline
+
+"""Tests for the WebSocket server helpers."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+import websockets
+
+from claude_jail.protocol import (
+    CloseSessionMessage,
+    DoneMessage,
+    QueryMessage,
+    TextMessage,
+    ToolUseMessage,
+)
+from claude_jail.server import ClaudeJailServer, FrameBatcher
+
+
+class FakeSocket:
+    """Collects frames passed to send() and serves queued frames to recv()."""
+
+    def __init__(self) -> None:
+        self.frames: list[bytes] = []
+        self.inbound: asyncio.Queue[bytes] = asyncio.Queue()
+
+    async def send(self, frame: bytes) -> None:
+        self.frames.append(frame)
+
+    async def recv(self) -> bytes:
+        return await self.inbound.get()
+
+
+class TestFrameBatcher:
+    """Tests for coalescing streamed text into batched frames."""
+
+    async def test_text_chunks_batched_into_array(self) -> None:
+        """Consecutive text chunks are sent as one JSON array frame."""
+        sock = FakeSocket()
+        batcher = FrameBatcher(sock.send, window=0.01)
+
+        await batcher.add(TextMessage(channel_id="!abc:test", content="Hello"))
+        await batcher.add(TextMessage(channel_id="!abc:test", content=" world"))
+        assert sock.frames == []
+
+        await asyncio.sleep(0.05)
+
+        assert len(sock.frames) == 1
+        assert json.loads(sock.frames[0]) == [
+            {"type": "text", "channel_id": "!abc:test", "content": "Hello"},
+            {"type": "text", "channel_id": "!abc:test", "content": " world"},
+        ]
+
+    async def test_single_text_chunk_sent_as_object(self) -> None:
+        """A lone buffered chunk is not wrapped in an array."""
+        sock = FakeSocket()
+        batcher = FrameBatcher(sock.send)
+
+        await batcher.add(TextMessage(channel_id="!abc:test", content="Hi"))
+        await batcher.flush()
+
+        assert json.loads(sock.frames[0]) == {
+            "type": "text",
+            "channel_id": "!abc:test",
+            "content": "Hi",
+        }
+
+    async def test_non_text_flushes_buffer_first(self) -> None:
+        """Tool use and done messages are sent after pending text, unbatched."""
+        sock = FakeSocket()
+        batcher = FrameBatcher(sock.send, window=10)
+
+        await batcher.add(TextMessage(channel_id="!abc:test", content="Let me check"))
+        await batcher.add(ToolUseMessage(channel_id="!abc:test", tool="Read", input={}))
+        await batcher.add(DoneMessage(channel_id="!abc:test", session_id="uuid-123"))
+
+        assert [json.loads(frame)["type"] for frame in sock.frames] == [
+            "text",
+            "tool_use",
+            "done",
+        ]
+
+    async def test_max_bytes_flushes_immediately(self) -> None:
+        """Exceeding the byte budget flushes without waiting for the window."""
+        sock = FakeSocket()
+        batcher = FrameBatcher(sock.send, window=10, max_bytes=64)
+
+        await batcher.add(TextMessage(channel_id="!abc:test", content="x" * 64))
+
+        assert len(sock.frames) == 1
+
+    async def test_flush_waits_for_timed_flush(self) -> None:
+        """An explicit flush sends after a timer flush already in progress."""
+        outbox: asyncio.Queue[bytes] = asyncio.Queue(maxsize=1)
+        outbox.put_nowait(b"{}")
+        batcher = FrameBatcher(outbox.put, window=0.01)
+
+        await batcher.add(TextMessage(channel_id="!abc:test", content="first"))
+        await asyncio.sleep(0.05)
+        await batcher.add(TextMessage(channel_id="!abc:test", content="second"))
+        flush = asyncio.create_task(batcher.flush())
+
+        frames = [await asyncio.wait_for(outbox.get(), 1) for _ in range(3)]
+        await flush
+
+        assert [json.loads(f).get("content") for f in frames] == [None, "first", "second"]
+
+    async def test_close_cancels_blocked_timed_flush(self) -> None:
+        """close() cancels a timed flush stuck on a full outbox."""
+        outbox: asyncio.Queue[bytes] = asyncio.Queue(maxsize=1)
+        outbox.put_nowait(b"{}")
+        batcher = FrameBatcher(outbox.put, window=0)
+
+        await batcher.add(TextMessage(channel_id="!abc:test", content="stuck"))
+        await asyncio.sleep(0.01)
+        task = batcher._flush_task
+        assert task is not None and not task.done()
+
+        batcher.close()
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+
+    async def test_close_leaves_no_flush_after_repeated_timers(self) -> None:
+        """Timers firing behind a blocked flush leave nothing pending after close()."""
+        outbox: asyncio.Queue[bytes] = asyncio.Queue(maxsize=1)
+        outbox.put_nowait(b"{}")
+        batcher = FrameBatcher(outbox.put, window=0.001)
+
+        await batcher.add(TextMessage(channel_id="!abc:test", content="1"))
+        await asyncio.sleep(0.01)
+        await batcher.add(TextMessage(channel_id="!abc:test", content="2"))
+        await asyncio.sleep(0.01)
+
+        batcher.close()
+        await asyncio.sleep(0)
+
+        pending = [
+            task
+            for task in asyncio.all_tasks()
+            if task is not asyncio.current_task() and "FrameBatcher" in task.get_coro().__qualname__
+        ]
+        assert pending == []
+
+
+class TestReceiveBatch:
+    """Tests for draining back-to-back inbound frames."""
+
+    async def test_burst_received_and_parsed_together(self) -> None:
+        """Queued frames are returned in order; invalid ones are dropped."""
+        sock = FakeSocket()
+        for raw in (
+            b'{"type": "query", "channel_id": "!a:test", "workspace": "/w", "prompt": "hi"}',
+            b"not valid json {{{",
+            b'{"type": "close_session", "channel_id": "!a:test"}',
+        ):
+            sock.inbound.put_nowait(raw)
+
+        messages = await ClaudeJailServer()._receive_batch(sock)
+
+        assert [type(m) for m in messages] == [QueryMessage, CloseSessionMessage]
+
+    async def test_single_frame_returns_after_window(self) -> None:
+        """A lone frame is returned once the receive window closes."""
+        sock = FakeSocket()
+        sock.inbound.put_nowait(b'{"type": "close_session", "channel_id": "!a:test"}')
+
+        messages = await asyncio.wait_for(ClaudeJailServer()._receive_batch(sock), 1)
+
+        assert len(messages) == 1
+
+
+class TestConnection:
+    """End-to-end tests over a real WebSocket connection."""
+
+    async def test_query_streams_through_writer(self) -> None:
+        """A query's responses reach the client batched and in order."""
+        server = ClaudeJailServer(port=0)
+
+        async def fake_process_query(
+            channel_id: str, **kwargs: object
+        ) -> AsyncIterator[TextMessage | DoneMessage]:
+            yield TextMessage(channel_id=channel_id, content="Hello")
+            yield TextMessage(channel_id=channel_id, content=" world")
+            yield DoneMessage(channel_id=channel_id, session_id="uuid-123")
+
+        server.session_manager.process_query = fake_process_query
+        await server.start()
+        try:
+            port = next(iter(server._server.sockets)).getsockname()[1]
+            async with websockets.connect(f"ws://127.0.0.1:{port}") as ws:
+                await ws.send(
+                    json.dumps(
+                        {
+                            "type": "query",
+                            "channel_id": "!a:test",
+                            "workspace": "/w",
+                            "prompt": "hi",
+                        }
+                    )
+                )
+                first = await asyncio.wait_for(ws.recv(), 1)
+                second = await asyncio.wait_for(ws.recv(), 1)
+        finally:
+            await server.stop()
+
+        assert isinstance(first, str)
+        assert [m["content"] for m in json.loads(first)] == ["Hello", " world"]
+        assert json.loads(second)["type"] == "done"
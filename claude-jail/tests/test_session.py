@@ -0,0 +1,91 @@
+# ABOUTME: Tests for session management
+# ABOUTME: Validates idle expiry of per-channel sessions
+
+"""Tests for session management."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from claude_jail.session import SessionManager
+
+
+class FakeClient:
+    """Stands in for ClaudeSDKClient, recording disconnects."""
+
+    def __init__(self, response_delay: float = 0) -> None:
+        self.response_delay = response_delay
+        self.disconnected = False
+
+    async def connect(self, prompt: str) -> None:
+        pass
+
+    async def receive_response(self) -> AsyncIterator[object]:
+        await asyncio.sleep(self.response_delay)
+        if False:
+            yield
+
+    def get_server_info(self) -> dict[str, str] | None:
+        return None
+
+    def disconnect(self) -> None:
+        self.disconnected = True
+
+
+class TestIdleExpiry:
+    """Tests for closing sessions after the idle timeout."""
+
+    async def test_idle_session_closed(self, tmp_path: Path) -> None:
+        """A session untouched for the idle timeout is closed."""
+        manager = SessionManager(idle_timeout_seconds=0.1)
+        await manager.start()
+        try:
+            session = await manager.get_or_create_session("!a:test", str(tmp_path))
+            session.client = FakeClient()
+
+            await asyncio.sleep(0.3)
+
+            assert "!a:test" not in manager.sessions
+            assert session.client.disconnected
+        finally:
+            await manager.stop()
+
+    async def test_touch_extends_expiry(self, tmp_path: Path) -> None:
+        """Reusing a session pushes its expiry back."""
+        manager = SessionManager(idle_timeout_seconds=0.3)
+        await manager.start()
+        try:
+            session = await manager.get_or_create_session("!a:test", str(tmp_path))
+            session.client = FakeClient()
+
+            await asyncio.sleep(0.2)
+            await manager.get_or_create_session("!a:test", str(tmp_path))
+            await asyncio.sleep(0.2)
+
+            assert "!a:test" in manager.sessions
+
+            await asyncio.sleep(0.3)
+
+            assert "!a:test" not in manager.sessions
+        finally:
+            await manager.stop()
+
+    async def test_in_flight_session_not_closed(self, tmp_path: Path) -> None:
+        """A session streaming a query outlives the idle timeout, then expires."""
+        manager = SessionManager(idle_timeout_seconds=0.1)
+        await manager.start()
+        try:
+            session = await manager.get_or_create_session("!a:test", str(tmp_path))
+            session.client = FakeClient(response_delay=0.3)
+
+            responses = [msg async for msg in manager.process_query("!a:test", str(tmp_path), "hi")]
+
+            assert responses[-1].type == "done"
+            assert not session.client.disconnected
+            assert session.in_flight == 0
+
+            await asyncio.sleep(0.3)
+
+            assert "!a:test" not in manager.sessions
+        finally:
+            await manager.stop()
@@ -7,13 +7,13 @@ Listens for messages starting with !claude and proxies them to the Claude CLI.
 from __future__ import annotations
 
 import asyncio
-import json
 import os
+import shutil
 import sys
 import uuid
-from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Optional
 
+import orjson
 from dotenv import load_dotenv
 from nio import (
     AsyncClient,
@@ -25,27 +25,62 @@ from nio import (
 load_dotenv()
 
 COMMAND_PREFIX = "!claude"
+_PREFIX_LEN = len(COMMAND_PREFIX)
+# Common spellings matched by a single C-level startswith before any lowercasing
+_PREFIX_VARIANTS = (
+    COMMAND_PREFIX,
+    # capitalize() alone would leave "!claude" untouched, since "!" has no case
+    COMMAND_PREFIX[0] + COMMAND_PREFIX[1:].capitalize(),
+    COMMAND_PREFIX.upper(),
+)
+_RESET_CMDS: frozenset[str] = frozenset(("/reset", "/restart"))
+_END_CMDS: frozenset[str] = frozenset(("/end", "/stop"))
+
+# Fixed replies, built once
+_USAGE_MSG = f"Usage: {COMMAND_PREFIX} <prompt>"
+_END_MSG = "✂️ Session ended."
+_RESET_MSG = "🔄 Session reset (new id: {})".format
 CLAUDE_BIN = os.environ.get("CLAUDE_BIN", "claude")
 SDK_URL = os.environ.get("SDK_URL")
 
+# Resolve the binary against PATH once instead of on every spawn
+_CLAUDE_BIN_PATH = shutil.which(CLAUDE_BIN) or CLAUDE_BIN
+
+# Flags shared by every CLI invocation, built once at import
+_CLAUDE_ARGV_BASE: tuple[str, ...] = (
+    _CLAUDE_BIN_PATH,
+    "--print",
+    "--output-format",
+    "json",
+) + (("--sdk-url", SDK_URL) if SDK_URL else ())
+
 
-@dataclass
-class SessionState:
-    session_id: str
-    started: bool = False
+# Per-room session state as parallel collections keyed by room id;
+# membership in _session_started means the CLI session already exists
+_session_ids: dict[str, str] = {}
+_session_short: dict[str, str] = {}
+_session_started: set[str] = set()
 
-    def cli_args(self) -> list[str]:
-        if self.started:
-            return ["--resume", self.session_id]
-        self.started = True
-        return ["--session-id", self.session_id]
 
-    def reset(self) -> None:
-        self.session_id = str(uuid.uuid4())
-        self.started = False
+def cli_args(room_id: str, session_id: str) -> tuple[str, str]:
+    if room_id in _session_started:
+        return ("--resume", session_id)
+    _session_started.add(room_id)
+    return ("--session-id", session_id)
 
 
-sessions: Dict[str, SessionState] = {}
+def new_session(room_id: str) -> str:
+    session_id = _session_ids[room_id] = str(uuid.uuid4())
+    # Sliced once here rather than on every logged message
+    _session_short[room_id] = session_id[:8]
+    _session_started.discard(room_id)
+    return session_id
+
+
+def end_session(room_id: str) -> None:
+    _session_ids.pop(room_id, None)
+    _session_short.pop(room_id, None)
+    _session_started.discard(room_id)
 
 
 def env_or_exit(name: str) -> str:
@@ -56,11 +91,8 @@ def env_or_exit(name: str) -> str:
     return value
 
 
-async def run_claude(prompt: str, state: SessionState) -> str:
-    args = [CLAUDE_BIN, "--print", "--output-format", "json", *state.cli_args()]
-    if SDK_URL:
-        args += ["--sdk-url", SDK_URL]
-    args.append(prompt)
+async def run_claude(prompt: str, room_id: str, session_id: str) -> str:
+    args = [*_CLAUDE_ARGV_BASE, *cli_args(room_id, session_id), prompt]
 
     # Log the command being run (hide the full prompt for brevity)
     args_display = args[:-1] + [f'"{prompt[:30]}..."']
@@ -72,28 +104,37 @@ async def run_claude(prompt: str, state: SessionState) -> str:
         stderr=asyncio.subprocess.PIPE,
     )
     stdout, stderr = await proc.communicate()
-    stdout_text = stdout.decode("utf-8", errors="ignore").strip()
-    stderr_text = stderr.decode("utf-8", errors="ignore").strip()
 
     if proc.returncode != 0:
         print(f"  ⚠️ Claude CLI failed with exit code {proc.returncode}")
-        raise RuntimeError(
-            f"Claude CLI exited with {proc.returncode}\n{stderr_text or stdout_text}"
-        )
+        # Decode only on failure; the happy path never looks at stderr
+        detail = (stderr.strip() or stdout.strip()).decode("utf-8", errors="ignore")
+        raise RuntimeError(f"Claude CLI exited with {proc.returncode}\n{detail}")
 
-    if not stdout_text:
+    if not stdout.strip():
         return "(no output)"
 
+    # orjson parses the raw bytes; only decode stdout when falling back to it
     try:
-        payload = json.loads(stdout_text)
-        parts = [block.get("text", "") for block in payload.get("content", [])]
-        text = "\n".join(parts).strip()
-        return text or stdout_text
-    except json.JSONDecodeError:
-        return stdout_text
+        payload = orjson.loads(stdout)
+    except orjson.JSONDecodeError:
+        return stdout.decode("utf-8", errors="ignore").strip()
+    # Blocks without text (e.g. tool use) would only add blank lines
+    parts = [block["text"] for block in payload.get("content", []) if "text" in block]
+    text = "\n".join(parts).strip()
+    return text or stdout.decode("utf-8", errors="ignore").strip()
 
 
 async def handle_message(room, event, client: AsyncClient, allowed_room_id: Optional[str]):
+    # The prefix test rejects almost every event, so it runs before the other guards
+    body = getattr(event, "body", None)
+    if not isinstance(body, str):
+        return
+    body = body.strip()
+    if not (
+        body.startswith(_PREFIX_VARIANTS) or body[:_PREFIX_LEN].lower() == COMMAND_PREFIX
+    ):
+        return
     # If a specific room_id is configured, only respond in that room
     if allowed_room_id and room.room_id != allowed_room_id:
         return
@@ -102,39 +143,36 @@ async def handle_message(room, event, client: AsyncClient, allowed_room_id: Opti
     if event.sender == client.user:
         return
 
-    body = event.body.strip()
-    if not body.lower().startswith(COMMAND_PREFIX):
-        return
-
     current_room_id = room.room_id
     print(f"📨 Received message in {current_room_id} from {event.sender}: {body}")
 
-    content = body[len(COMMAND_PREFIX) :].strip()
+    content = body[_PREFIX_LEN:].strip()
     if not content:
-        await send_message(client, current_room_id, "Usage: !claude <prompt>")
+        await send_message(client, current_room_id, _USAGE_MSG)
         return
 
-    session = sessions.setdefault(current_room_id, SessionState(str(uuid.uuid4())))
-    print(f"🔑 Using session: {session.session_id[:8]}... (started: {session.started})")
-
-    if content in {"/reset", "/restart"}:
+    # Session commands are handled before looking up (or creating) a session
+    if content in _RESET_CMDS:
         print(f"🔄 Resetting session...")
-        session.reset()
-        sessions[current_room_id] = session
-        await send_message(
-            client, current_room_id, f"🔄 Session reset (new id: {session.session_id})"
-        )
+        session_id = new_session(current_room_id)
+        await send_message(client, current_room_id, _RESET_MSG(session_id))
         return
-    if content in {"/end", "/stop"}:
+    if content in _END_CMDS:
         print(f"✂️ Ending session...")
-        sessions.pop(current_room_id, None)
-        await send_message(client, current_room_id, "✂️ Session ended.")
+        end_session(current_room_id)
+        await send_message(client, current_room_id, _END_MSG)
         return
 
+    session_id = _session_ids.get(current_room_id)
+    if session_id is None:
+        session_id = new_session(current_room_id)
+    started = current_room_id in _session_started
+    print(f"🔑 Using session: {_session_short[current_room_id]}... (started: {started})")
+
     print(f"🤖 Invoking Claude CLI with prompt: {content[:50]}...")
     await send_typing(client, current_room_id, timeout=30000)
     try:
-        response = await run_claude(content, session)
+        response = await run_claude(content, current_room_id, session_id)
         print(f"✅ Claude responded ({len(response)} chars)")
     except Exception as exc:  # pylint: disable=broad-except
         print(f"❌ Claude error: {exc}")
@@ -210,6 +248,7 @@ async def main() -> None:
         client.user_id = user_id
 
     await login_client(client, password)
+    # nio awaits callbacks one at a time, so Claude turns run serially
     client.add_event_callback(
         lambda room, event: handle_message(room, event, client, room_id),
         RoomMessageText,
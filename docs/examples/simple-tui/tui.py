@@ -3,22 +3,58 @@
 
 from __future__ import annotations
 
-import json
 import os
 import subprocess
 import sys
 import uuid
 
+import orjson
+
 
 CLAUDE_BIN = os.environ.get("CLAUDE_BIN", "claude")
 SDK_URL = os.environ.get("SDK_URL")
 
+# Flags shared by every CLI invocation, built once at import
+_CLAUDE_ARGV_BASE: tuple[str, ...] = (CLAUDE_BIN, "--print", "--output-format", "json") + (
+    ("--sdk-url", SDK_URL) if SDK_URL else ()
+)
+
+
+def _session_id_from_env() -> str | None:
+    existing = os.environ.get("SESSION_ID")
+    if existing:
+        try:
+            return str(uuid.UUID(existing))
+        except ValueError:
+            print(
+                "Warning: SESSION_ID was not a valid UUID; generating a new one.",
+                file=sys.stderr,
+            )
+    return None
+
+
+# Validated once at startup rather than per Session
+_INITIAL_SESSION_ID = _session_id_from_env()
+
+# Erase the display and home the cursor
+_CLEAR_SCREEN = "\x1b[2J\x1b[H"
+
+# Display labels for history roles; other roles are shown as-is
+_PREFIXES = {"user": "You", "assistant": "Claude"}
+
 
 def clear_screen() -> None:
-    os.system("cls" if os.name == "nt" else "clear")
+    if os.name == "nt":
+        # Classic Windows consoles don't interpret ANSI escapes by default
+        os.system("cls")
+        return
+    sys.stdout.write(_CLEAR_SCREEN)
+    sys.stdout.flush()
 
 
 class Session:
+    __slots__ = ("session_id", "started", "history")
+
     def __init__(self) -> None:
         self.session_id = self._initial_session_id()
         self.started = False
@@ -30,69 +66,61 @@ class Session:
         self.history.append(("system", f"Started new session: {self.session_id}"))
 
     def render(self) -> None:
-        clear_screen()
-        print("Claude Code – Simple Python TUI\n")
-        print(f"Session: {self.session_id}")
+        if os.name == "nt":
+            clear_screen()
+            parts = []
+        else:
+            # Fold the clear into the frame so the redraw is a single write
+            parts = [_CLEAR_SCREEN]
+        parts += ["Claude Code – Simple Python TUI\n\n", f"Session: {self.session_id}\n"]
         if SDK_URL:
-            print(f"SDK URL: {SDK_URL}")
-        print("Commands: /reset, /quit\n")
-        for role, text in self.history:
-            prefix = {"user": "You", "assistant": "Claude"}.get(role, role)
-            print(f"{prefix}:")
-            print(text.strip(), end="\n\n")
+            parts.append(f"SDK URL: {SDK_URL}\n")
+        parts.append("Commands: /reset, /quit\n\n")
+        parts += [
+            f"{_PREFIXES.get(role, role)}:\n{text.strip()}\n\n" for role, text in self.history
+        ]
+
+        sys.stdout.write("".join(parts))
+        sys.stdout.flush()
 
     def run_turn(self, message: str) -> None:
         self.history.append(("user", message))
-        args = [
-            CLAUDE_BIN,
-            "--print",
-            "--output-format",
-            "json",
-        ]
         if self.started:
-            args.extend(["--resume", self.session_id])
+            session_args = ("--resume", self.session_id)
         else:
-            args.extend(["--session-id", self.session_id])
+            session_args = ("--session-id", self.session_id)
             self.started = True
-        if SDK_URL:
-            args.extend(["--sdk-url", SDK_URL])
 
         proc = subprocess.Popen(
-            args + [message],
+            [*_CLAUDE_ARGV_BASE, *session_args, message],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
         )
+        # Binary pipes: orjson parses stdout bytes directly, and output is
+        # only decoded for display on the error and fallback paths
         stdout, stderr = proc.communicate()
         if proc.returncode != 0:
+            error = stderr.decode("utf-8", errors="replace").strip()
             self.history.append(
                 (
                     "error",
-                    f"Claude CLI exited with code {proc.returncode}:\n{stderr.strip()}",
+                    f"Claude CLI exited with code {proc.returncode}:\n{error}",
                 )
             )
             return
         try:
-            payload = json.loads(stdout.strip())
+            payload = orjson.loads(stdout)
+            # Blocks without text (e.g. tool use) would only add blank lines
             text = "\n".join(
-                block.get("text", "") for block in payload.get("content", [])
+                [block["text"] for block in payload.get("content", []) if "text" in block]
             ).strip()
-            text = text or stdout.strip()
-        except json.JSONDecodeError:
-            text = f"[parse error]\n{stdout.strip()}"
+            text = text or stdout.decode("utf-8", errors="replace").strip()
+        except orjson.JSONDecodeError:
+            text = f"[parse error]\n{stdout.decode('utf-8', errors='replace').strip()}"
         self.history.append(("assistant", text))
 
     def _initial_session_id(self) -> str:
-        existing = os.environ.get("SESSION_ID")
-        if existing:
-            try:
-                return str(uuid.UUID(existing))
-            except ValueError:
-                print(
-                    "Warning: SESSION_ID was not a valid UUID; generating a new one.",
-                    file=sys.stderr,
-                )
-        return str(uuid.uuid4())
+        return _INITIAL_SESSION_ID or str(uuid.uuid4())
 
 
 def main() -> None:
@@ -50,6 +50,26 @@ enum JailResponse {
     },
 }
 
+/// A frame from Claude Jail: one response, or a batch of streamed text chunks
+#[derive(Debug)]
+enum JailFrame {
+    Batch(Vec<JailResponse>),
+    Single(JailResponse),
+}
+
+/// Parse a frame, picking the shape from its first character.
+///
+/// `#[serde(untagged)]` would replace serde's specific "unknown variant" error
+/// with a generic "did not match any variant", so dispatch by hand instead.
+fn parse_frame(text: &str) -> Result<JailFrame> {
+    let frame = if text.trim_start().starts_with('[') {
+        JailFrame::Batch(serde_json::from_str(text)?)
+    } else {
+        JailFrame::Single(serde_json::from_str(text)?)
+    };
+    Ok(frame)
+}
+
 type WebSocketStream = tokio_tungstenite::WebSocketStream<
     tokio_tungstenite::MaybeTlsStream<tokio::net::TcpStream>,
 >;
@@ -128,11 +148,23 @@ impl ClaudeJailClient {
         }
     }
 
-    /// Handle a single message from Claude Jail
+    /// Handle a single frame from Claude Jail
     async fn handle_message(text: &str, pending: &PendingChannels) -> Result<()> {
-        let response: JailResponse =
-            serde_json::from_str(text).context("Failed to parse response")?;
+        let frame = parse_frame(text).context("Failed to parse response")?;
 
+        match frame {
+            JailFrame::Single(response) => Self::handle_response(response, pending).await,
+            JailFrame::Batch(responses) => {
+                for response in responses {
+                    Self::handle_response(response, pending).await?;
+                }
+                Ok(())
+            }
+        }
+    }
+
+    /// Route a single response to its channel handler
+    async fn handle_response(response: JailResponse, pending: &PendingChannels) -> Result<()> {
         let (channel_id, event) = match response {
             JailResponse::Text { channel_id, content } => {
                 // For now, we accumulate text - emit as part of final result
@@ -324,3 +356,46 @@ pub async fn invoke_claude_streaming(
         .query(channel_id, workspace, prompt, session_id)
         .await
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn parse_frame_batch() {
+        let frame = parse_frame(
+            r#"[{"type":"text","channel_id":"!a:test","content":"Hello"},{"type":"text","channel_id":"!a:test","content":" world"}]"#,
+        )
+        .unwrap();
+
+        match frame {
+            JailFrame::Batch(responses) => {
+                assert_eq!(responses.len(), 2);
+                assert!(matches!(
+                    &responses[1],
+                    JailResponse::Text { content, .. } if content == " world"
+                ));
+            }
+            JailFrame::Single(_) => panic!("expected a batch frame"),
+        }
+    }
+
+    #[test]
+    fn parse_frame_single() {
+        let frame =
+            parse_frame(r#"{"type":"done","channel_id":"!a:test","session_id":"uuid-123"}"#)
+                .unwrap();
+
+        assert!(matches!(
+            frame,
+            JailFrame::Single(JailResponse::Done { ref session_id, .. }) if session_id == "uuid-123"
+        ));
+    }
+
+    #[test]
+    fn parse_frame_unknown_type_keeps_serde_error() {
+        let err = parse_frame(r#"{"type":"bogus","channel_id":"!a:test"}"#).unwrap_err();
+
+        assert!(err.to_string().contains("unknown variant `bogus`"), "{err}");
+    }
+}